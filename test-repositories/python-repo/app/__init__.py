@@ -1,6 +1,8 @@
-from flask import Flask
+from flask import Flask, g, request, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from os import path
+from .utils.json_provider import OrjsonProvider
 
 db = SQLAlchemy()
 DB_NAME = "site.db"
@@ -14,9 +16,14 @@ def create_app():
     """
     app = Flask(__name__)
     app.config.from_object('config.DevelopmentConfig')
+    app.json = OrjsonProvider(app)
     
     db.init_app(app)
     
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', enable_sqlite_foreign_keys)
+    
     from .routes.auth import auth
     from .routes.posts import posts
     
@@ -27,8 +34,23 @@ def create_app():
     
     create_database(app)
     
+    if app.config.get('DEBUG') or app.config.get('TESTING'):
+        register_query_counter(app)
+    
     return app
 
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    Turns on foreign key enforcement, which SQLite leaves off by default
+    
+    Args:
+        dbapi_connection: Raw DB-API connection that was just opened
+        connection_record: Pool record for the connection
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
 def create_database(app):
     """
     Creates the database if it doesn't exist
@@ -39,4 +61,36 @@ def create_database(app):
     if not path.exists('instance/' + DB_NAME):
         with app.app_context():
             db.create_all()
-            print('Created Database!') 
\ No newline at end of file
+            print('Created Database!') 
+
+def register_query_counter(app):
+    """
+    Logs requests that run more SQL queries than QUERY_COUNT_THRESHOLD
+    
+    Enabled in debug and testing so new N+1 query patterns show up early.
+    
+    Args:
+        app (Flask): The Flask application
+    """
+    threshold = app.config.get('QUERY_COUNT_THRESHOLD', 15)
+    
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and hasattr(g, '_queries'):
+            g._queries.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record_query)
+    
+    @app.before_request
+    def start_query_count():
+        g._queries = []
+    
+    @app.after_request
+    def check_query_count(response):
+        queries = g.pop('_queries', [])
+        if len(queries) > threshold:
+            app.logger.warning(
+                '%s %s ran %d queries (threshold %d):\n%s',
+                request.method, request.path, len(queries), threshold, '\n'.join(queries)
+            )
+        return response
@@ -12,8 +12,10 @@ class Post(db.Model):
         date_created (datetime): Date post was created
         date_updated (datetime): Date post was last updated
         user_id (int): Foreign key to User model
-        comments (relationship): Relationship to Comment model
+        author (relationship): Relationship to User model
+        comments (relationship): Relationship to Comment model, must be loaded explicitly
         tags (relationship): Many-to-many relationship with Tag model
+        content_preview (str): Truncated content, only set by queries that request it
     """
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
@@ -21,13 +23,22 @@ class Post(db.Model):
     date_created = db.Column(db.DateTime(timezone=True), default=func.now())
     date_updated = db.Column(db.DateTime(timezone=True), onupdate=func.now())
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    comments = db.relationship('Comment', backref='post', lazy=True, cascade="all, delete-orphan")
-    tags = db.relationship('Tag', secondary='post_tags', backref=db.backref('posts', lazy='dynamic'))
+    author = db.relationship('User', back_populates='posts')
+    comments = db.relationship('Comment', back_populates='post', lazy='raise', cascade="all, delete-orphan")
+    tags = db.relationship('Tag', secondary='post_tags', back_populates='posts', lazy='select')
+    content_preview = db.query_expression()
     
     def __repr__(self):
         return f"Post('{self.title}', '{self.date_created}')"
 
 
+# Listing order and keyset cursor, read backwards for the newest-first feed
+db.Index('ix_post_date_id', Post.date_created, Post.id)
+
+# Per-author feed index; its leading column also serves plain user_id lookups
+db.Index('ix_post_user_date', Post.user_id, Post.date_created.desc())
+
+
 class Comment(db.Model):
     """
     Comment model for storing post comments
@@ -38,13 +49,16 @@ class Comment(db.Model):
         date_created (datetime): Date comment was created
         post_id (int): Foreign key to Post model
         user_id (int): Foreign key to User model
+        post (relationship): Relationship to Post model
+        author (relationship): Relationship to User model
     """
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
     date_created = db.Column(db.DateTime(timezone=True), default=func.now())
-    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    author = db.relationship('User', backref=db.backref('comments', lazy=True))
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    post = db.relationship('Post', back_populates='comments')
+    author = db.relationship('User', back_populates='comments')
     
     def __repr__(self):
         return f"Comment('{self.content[:20]}...', '{self.date_created}')"
@@ -58,9 +72,11 @@ class Tag(db.Model):
     Attributes:
         id (int): Primary key
         name (str): Tag name
+        posts (relationship): Query of posts with this tag
     """
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+    posts = db.relationship('Post', secondary='post_tags', back_populates='tags', lazy='dynamic')
     
     def __repr__(self):
         return f"Tag('{self.name}')"
@@ -1,7 +1,19 @@
+import os
+import threading
 from .. import db
 from flask_login import UserMixin
+from sqlalchemy import select
 from sqlalchemy.sql import func
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+
+# Argon2id at OWASP's recommended 46 MiB / 2 iterations / 1 lane
+password_hasher = PasswordHasher(time_cost=2, memory_cost=47104, parallelism=1)
+
+# argon2-cffi releases the GIL while hashing, so other requests keep running;
+# this only caps how many 46 MiB hashes are in memory at once
+_hash_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
 
 class User(db.Model, UserMixin):
     """
@@ -13,17 +25,34 @@ class User(db.Model, UserMixin):
         username (str): User username, must be unique
         password_hash (str): Hashed password
         date_created (datetime): Date user was created
-        posts (relationship): Relationship to Post model
+        posts (relationship): Relationship to Post model, must be loaded explicitly
+        comments (relationship): Relationship to Comment model, must be loaded explicitly
+        profile (relationship): One-to-one relationship to Profile model
         role (str): User role (admin, user)
     """
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(150), unique=True, nullable=False)
     username = db.Column(db.String(150), unique=True, nullable=False)
-    password_hash = db.Column(db.String(150), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     date_created = db.Column(db.DateTime(timezone=True), default=func.now())
-    posts = db.relationship('Post', backref='author', lazy=True, cascade="all, delete-orphan")
+    posts = db.relationship('Post', back_populates='author', lazy='raise', cascade="all, delete-orphan")
+    comments = db.relationship('Comment', back_populates='author', lazy='raise')
+    profile = db.relationship('Profile', back_populates='user', uselist=False, cascade="all, delete-orphan")
     role = db.Column(db.String(20), default='user')
     
+    @classmethod
+    def by_email(cls, email):
+        """
+        Looks up a user by email address
+        
+        Args:
+            email (str): Email address to look up
+            
+        Returns:
+            User: The matching user, or None if there is none
+        """
+        return db.session.execute(select(cls).where(cls.email == email)).scalar_one_or_none()
+    
     def set_password(self, password):
         """
         Sets the password hash from a plaintext password
@@ -31,19 +60,39 @@ class User(db.Model, UserMixin):
         Args:
             password (str): Plaintext password
         """
-        self.password_hash = generate_password_hash(password)
+        with _hash_slots:
+            self.password_hash = password_hasher.hash(password)
         
     def check_password(self, password):
         """
         Checks if the provided password matches the stored hash
         
+        Hashes made with outdated parameters, or with werkzeug before the
+        switch to Argon2, are replaced after a successful check. The new hash
+        is only set on the user; committing it is left to the caller.
+        
         Args:
             password (str): Plaintext password to check
             
         Returns:
             bool: True if password matches, False otherwise
         """
-        return check_password_hash(self.password_hash, password)
+        try:
+            with _hash_slots:
+                password_hasher.verify(self.password_hash, password)
+            needs_rehash = password_hasher.check_needs_rehash(self.password_hash)
+        except VerificationError:
+            # Wrong password, or a truncated/corrupt Argon2 hash
+            return False
+        except InvalidHashError:
+            if not check_password_hash(self.password_hash, password):
+                return False
+            needs_rehash = True
+        
+        if needs_rehash:
+            self.set_password(password)
+            
+        return True
     
     def is_admin(self):
         """
@@ -75,7 +124,7 @@ class Profile(db.Model):
     last_name = db.Column(db.String(50))
     bio = db.Column(db.Text)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), unique=True)
-    user = db.relationship('User', backref=db.backref('profile', uselist=False))
+    user = db.relationship('User', back_populates='profile')
     
     def __repr__(self):
         return f"Profile('{self.first_name} {self.last_name}')" 
\ No newline at end of file
@@ -3,10 +3,11 @@ from ..models.user import User, Profile
 from .. import db
 from werkzeug.security import generate_password_hash, check_password_hash
 from ..utils.validators import validate_email, validate_password
-from ..services.email import send_welcome_email, send_password_reset
-import jwt
-import datetime
-import os
+from ..utils.helpers import JWT_SECRET_KEY, JWT_ALGORITHM, jwt_codec
+from ..services.email import send_email_async, send_welcome_email, send_password_reset
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+import time
 
 auth = Blueprint('auth', __name__)
 
@@ -37,12 +38,13 @@ def register():
     if not validate_password(data['password']):
         return jsonify({'error': 'Password must be at least 8 characters and contain a number and a special character'}), 400
     
-    # Check if email already exists
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 400
-        
-    # Check if username already exists
-    if User.query.filter_by(username=data['username']).first():
+    # Check if email or username already exists
+    existing = db.session.query(User.email, User.username).filter(
+        or_(User.email == data['email'], User.username == data['username'])
+    ).first()
+    if existing:
+        if existing.email == data['email']:
+            return jsonify({'error': 'Email already registered'}), 400
         return jsonify({'error': 'Username already taken'}), 400
     
     # Create a new user
@@ -52,16 +54,20 @@ def register():
     )
     new_user.set_password(data['password'])
     
+    # Create user profile; both rows are inserted in the same transaction
+    new_user.profile = Profile()
+    
     db.session.add(new_user)
-    db.session.commit()
     
-    # Create user profile
-    profile = Profile(user_id=new_user.id)
-    db.session.add(profile)
-    db.session.commit()
+    # The unique constraints still catch a registration racing this one
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Email or username already registered'}), 400
     
-    # Send welcome email
-    send_welcome_email(new_user.email, new_user.username)
+    # Send welcome email in the background
+    send_email_async(send_welcome_email, new_user.email, new_user.username)
     
     return jsonify({
         'message': 'User registered successfully',
@@ -86,16 +92,20 @@ def login():
     if not all(k in data for k in ('email', 'password')):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    user = User.query.filter_by(email=data['email']).first()
+    user = User.by_email(data['email'])
     
     if not user or not user.check_password(data['password']):
         return jsonify({'error': 'Invalid email or password'}), 401
     
+    # Save the hash if check_password upgraded it
+    if db.session.is_modified(user):
+        db.session.commit()
+    
     # Generate JWT token
-    token = jwt.encode({
+    token = jwt_codec.encode({
         'user_id': user.id,
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-    }, os.environ.get('SECRET_KEY', 'dev_key'), algorithm='HS256')
+        'exp': int(time.time()) + 24 * 60 * 60
+    }, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     
     return jsonify({
         'message': 'Login successful',
@@ -132,19 +142,19 @@ def reset_password():
     if 'email' not in data:
         return jsonify({'error': 'Email is required'}), 400
     
-    user = User.query.filter_by(email=data['email']).first()
+    user = User.by_email(data['email'])
     
     if not user:
         # Don't reveal that the user doesn't exist
         return jsonify({'message': 'If the email exists, a reset link has been sent'}), 200
     
     # Generate reset token
-    reset_token = jwt.encode({
+    reset_token = jwt_codec.encode({
         'user_id': user.id,
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(minutes=30)
-    }, os.environ.get('SECRET_KEY', 'dev_key'), algorithm='HS256')
+        'exp': int(time.time()) + 30 * 60
+    }, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     
-    # Send password reset email
-    send_password_reset(user.email, reset_token)
+    # Send password reset email in the background
+    send_email_async(send_password_reset, user.email, reset_token)
     
     return jsonify({'message': 'If the email exists, a reset link has been sent'}), 200 
\ No newline at end of file
@@ -1,12 +1,42 @@
-from flask import Blueprint, request, jsonify
-from ..models.post import Post, Comment, Tag
+from flask import Blueprint, request, jsonify, abort
+from ..models.post import Post, Comment, Tag, post_tags
 from ..models.user import User
 from .. import db
 from ..utils.helpers import token_required
-from sqlalchemy import desc
+from collections import defaultdict
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload, raiseload, load_only, with_expression
 
 posts = Blueprint('posts', __name__)
 
+# Largest page a client can ask for in either pagination mode
+MAX_PER_PAGE = 100
+
+def get_or_create_tags(tag_names):
+    """
+    Resolve tag names to Tag objects, creating any that don't exist yet
+    
+    Args:
+        tag_names (list): List of tag names, duplicates are ignored
+        
+    Returns:
+        list: Tag objects in the order the names were first given
+    """
+    names = list(dict.fromkeys(tag_names))
+    if not names:
+        return []
+    
+    # One IN query for the existing tags instead of one lookup per name
+    tags_by_name = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names)).all()}
+    
+    missing = [Tag(name=name) for name in names if name not in tags_by_name]
+    if missing:
+        db.session.add_all(missing)
+        tags_by_name.update((tag.name, tag) for tag in missing)
+    
+    return [tags_by_name[name] for name in names]
+
 @posts.route('/', methods=['GET'])
 def get_posts():
     """
@@ -14,15 +44,26 @@ def get_posts():
     
     Query parameters:
         page (int): Page number (default: 1)
-        per_page (int): Items per page (default: 10)
+        per_page (int): Items per page (default: 10, at most MAX_PER_PAGE)
+        after (int): Cursor from a previous response's next_cursor; when given,
+            the posts following it are returned instead of a numbered page (optional)
         tag (str): Filter by tag name (optional)
+        fields (str): 'summary' to return only the first 200 characters of content (optional)
         
     Returns:
         JSON: List of posts with pagination metadata
     """
     page = request.args.get('page', 1, type=int)
+    after = request.args.get('after', type=int)
     per_page = request.args.get('per_page', 10, type=int)
+    
+    # Checked once for both modes so a negative or zero size can't reach LIMIT
+    if per_page < 1:
+        per_page = 10
+    per_page = min(per_page, MAX_PER_PAGE)
+    
     tag = request.args.get('tag')
+    summary = request.args.get('fields') == 'summary'
     
     query = Post.query
     
@@ -31,31 +72,81 @@ def get_posts():
         if tag_obj:
             query = tag_obj.posts
     
-    posts_pagination = query.order_by(desc(Post.date_created)).paginate(
-        page=page, per_page=per_page, error_out=False
+    # Only fetch the columns the response uses; in summary mode the content is
+    # truncated by the database so the full text never leaves it
+    columns = [Post.id, Post.title, Post.date_created, Post.date_updated, Post.user_id]
+    if summary:
+        query = query.options(with_expression(Post.content_preview, func.substr(Post.content, 1, 200)))
+    else:
+        columns.append(Post.content)
+    
+    # Load authors for the whole page up front; any other lazy load raises
+    query = query.options(
+        load_only(*columns),
+        selectinload(Post.author).load_only(User.id, User.username),
+        raiseload('*')
     )
     
+    # id breaks ties so the order, and therefore the cursor, is stable
+    query = query.order_by(desc(Post.date_created), desc(Post.id))
+    
+    if after is not None:
+        # Keyset pagination: seek past the cursor post on the (date_created, id)
+        # index instead of scanning and discarding every earlier page
+        cursor_date = db.session.query(Post.date_created).filter(Post.id == after).scalar_subquery()
+        items = query.filter(
+            tuple_(Post.date_created, Post.id) < tuple_(cursor_date, after)
+        ).limit(per_page + 1).all()
+        # The extra row only tells us whether another page follows
+        has_next = len(items) > per_page
+        items = items[:per_page]
+    else:
+        posts_pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        items = posts_pagination.items
+        has_next = posts_pagination.has_next
+    
+    # Tag names for the whole page in one query straight off the association
+    # table, without building Tag objects
+    tag_names = defaultdict(list)
+    if items:
+        tag_rows = db.session.execute(
+            select(post_tags.c.post_id, Tag.name)
+            .join(Tag, Tag.id == post_tags.c.tag_id)
+            .where(post_tags.c.post_id.in_([post.id for post in items]))
+        )
+        for post_id, name in tag_rows:
+            tag_names[post_id].append(name)
+    
     posts_list = []
-    for post in posts_pagination.items:
-        author = User.query.get(post.user_id)
+    for post in items:
+        author = post.author
         posts_list.append({
             'id': post.id,
             'title': post.title,
-            'content': post.content,
+            'content': post.content_preview if summary else post.content,
             'date_created': post.date_created,
             'date_updated': post.date_updated,
             'author': {
                 'id': author.id,
                 'username': author.username
             },
-            'tags': [tag.name for tag in post.tags]
+            'tags': tag_names.get(post.id, [])
         })
     
+    next_cursor = items[-1].id if items and has_next else None
+    
+    if after is not None:
+        return jsonify({
+            'posts': posts_list,
+            'next_cursor': next_cursor
+        }), 200
+    
     return jsonify({
         'posts': posts_list,
         'total': posts_pagination.total,
         'pages': posts_pagination.pages,
-        'current_page': page
+        'current_page': page,
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -70,13 +161,21 @@ def get_post(post_id):
     Returns:
         JSON: Post details
     """
-    post = Post.query.get_or_404(post_id)
-    author = User.query.get(post.user_id)
+    # Join the author and the (small, bounded) comment set with their authors in
+    # one query; tags go through a separate IN query to avoid a cartesian product
+    post = db.session.get(Post, post_id, options=[
+        joinedload(Post.author),
+        joinedload(Post.comments).joinedload(Comment.author),
+        selectinload(Post.tags)
+    ])
+    if post is None:
+        abort(404)
+    author = post.author
     
     # Get comments
     comments = []
     for comment in post.comments:
-        comment_author = User.query.get(comment.user_id)
+        comment_author = comment.author
         comments.append({
             'id': comment.id,
             'content': comment.content,
@@ -129,19 +228,18 @@ def create_post(current_user):
     
     # Add tags if provided
     if 'tags' in data and isinstance(data['tags'], list):
-        for tag_name in data['tags']:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            new_post.tags.append(tag)
+        new_post.tags = get_or_create_tags(data['tags'])
     
+    # The post_tags rows go out in the same flush as one executemany; read the
+    # new ID before committing so the expired post isn't reloaded just for it
     db.session.add(new_post)
+    db.session.flush()
+    post_id = new_post.id
     db.session.commit()
     
     return jsonify({
         'message': 'Post created successfully',
-        'post_id': new_post.id
+        'post_id': post_id
     }), 201
 
 
@@ -162,7 +260,9 @@ def update_post(current_user, post_id):
     Returns:
         JSON: Success message
     """
-    post = Post.query.get_or_404(post_id)
+    post = db.session.get(Post, post_id)
+    if post is None:
+        abort(404)
     
     # Check if the user is the author
     if post.user_id != current_user.id and not current_user.is_admin():
@@ -178,16 +278,11 @@ def update_post(current_user, post_id):
     
     # Update tags if provided
     if 'tags' in data and isinstance(data['tags'], list):
-        # Clear existing tags
-        post.tags = []
-        
-        # Add new tags
-        for tag_name in data['tags']:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            post.tags.append(tag)
+        # Replacing the collection only touches post_tags rows for tags that
+        # were actually added or removed
+        new_tags = get_or_create_tags(data['tags'])
+        if new_tags != post.tags:
+            post.tags = new_tags
     
     db.session.commit()
     
@@ -206,7 +301,9 @@ def delete_post(current_user, post_id):
     Returns:
         JSON: Success message
     """
-    post = Post.query.get_or_404(post_id)
+    post = db.session.get(Post, post_id)
+    if post is None:
+        abort(404)
     
     # Check if the user is the author
     if post.user_id != current_user.id and not current_user.is_admin():
@@ -233,11 +330,9 @@ def add_comment(current_user, post_id):
     Returns:
         JSON: Success message and comment ID
     """
-    Post.query.get_or_404(post_id)  # Check if post exists
-    
     data = request.get_json()
     
-    if 'content' not in data:
+    if data.get('content') is None:
         return jsonify({'error': 'Content is required'}), 400
     
     new_comment = Comment(
@@ -247,7 +342,16 @@ def add_comment(current_user, post_id):
     )
     
     db.session.add(new_comment)
-    db.session.commit()
+    
+    # The post_id foreign key rejects comments on missing posts, so the post is
+    # only looked up when the insert fails, to tell that apart from other errors
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        if db.session.get(Post, post_id) is None:
+            abort(404)
+        raise
     
     return jsonify({
         'message': 'Comment added successfully',
@@ -1,5 +1,9 @@
 import os
+import re
+import atexit
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from ..utils.helpers import format_email_template
@@ -8,6 +12,9 @@ import logging
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Matches any HTML tag left after line breaks are converted
+_TAG_RE = re.compile(r'<[^>]+>')
+
 class EmailConfig:
     """
     Email configuration class for SMTP settings
@@ -21,28 +28,101 @@ class EmailConfig:
         self.from_name = os.environ.get('FROM_NAME', 'My Flask App')
         self.debug_mode = os.environ.get('EMAIL_DEBUG', 'True').lower() == 'true'
         
+        # One open connection per thread, reused across sends
+        self._local = threading.local()
+        self._connections = set()
+        self._lock = threading.Lock()
+        
     def get_connection(self):
         """
-        Create and return an SMTP connection
+        Return this thread's SMTP connection, reconnecting only if it went stale
         
         Returns:
             smtplib.SMTP: SMTP connection
         """
         if self.debug_mode:
-            logger.info(f"Would connect to {self.smtp_server}:{self.smtp_port}")
+            logger.info("Would connect to %s:%s", self.smtp_server, self.smtp_port)
             return None
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.discard_connection(conn)
             
         try:
             conn = smtplib.SMTP(self.smtp_server, self.smtp_port)
             conn.starttls()
             conn.login(self.smtp_username, self.smtp_password)
-            return conn
         except Exception as e:
-            logger.error(f"Failed to connect to SMTP server: {str(e)}")
+            logger.error("Failed to connect to SMTP server: %s", e)
             return None
+        
+        self._local.conn = conn
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+    
+    def discard_connection(self, conn):
+        """
+        Close a connection and stop reusing it
+        
+        Args:
+            conn (smtplib.SMTP): SMTP connection to drop
+        """
+        if getattr(self._local, 'conn', None) is conn:
+            self._local.conn = None
+        with self._lock:
+            self._connections.discard(conn)
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+    
+    def close(self):
+        """
+        Close every open SMTP connection
+        """
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            self.discard_connection(conn)
 
 # Initialize email configuration
 email_config = EmailConfig()
+atexit.register(email_config.close)
+
+# Background workers so requests don't wait on the SMTP round-trips
+_email_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='email')
+
+def _log_send_failure(future):
+    """
+    Log an exception raised by a queued email send
+    
+    Args:
+        future (concurrent.futures.Future): Completed send
+    """
+    error = future.exception()
+    if error is not None:
+        logger.error("Background email send failed: %s", error)
+
+def send_email_async(send_func, *args):
+    """
+    Queue one of the send functions to run on the background email pool
+    
+    Args:
+        send_func (callable): Email function to run, e.g. send_welcome_email
+        *args: Arguments passed to send_func
+        
+    Returns:
+        concurrent.futures.Future: Future resolving to send_func's result
+    """
+    future = _email_pool.submit(send_func, *args)
+    future.add_done_callback(_log_send_failure)
+    return future
 
 def send_email(to_email, subject, html_content, text_content=None):
     """
@@ -58,8 +138,8 @@ def send_email(to_email, subject, html_content, text_content=None):
         bool: True if email sent successfully, False otherwise
     """
     if email_config.debug_mode:
-        logger.info(f"Would send email to {to_email} with subject '{subject}'")
-        logger.debug(f"Email content: {html_content}")
+        logger.info("Would send email to %s with subject '%s'", to_email, subject)
+        logger.debug("Email content: %s", html_content)
         return True
         
     msg = MIMEMultipart('alternative')
@@ -71,7 +151,8 @@ def send_email(to_email, subject, html_content, text_content=None):
     if text_content is None:
         # Simple conversion from HTML to text (in a real app, use a proper HTML->text converter)
         text_content = html_content.replace('<br>', '\n').replace('</p>', '\n\n')
-        text_content = ''.join(c for c in text_content if ord(c) < 128)  # Strip non-ASCII chars
+        text_content = _TAG_RE.sub('', text_content)
+        text_content = text_content.encode('ascii', 'ignore').decode('ascii')  # Strip non-ASCII chars
     
     msg.attach(MIMEText(text_content, 'plain'))
     msg.attach(MIMEText(html_content, 'html'))
@@ -82,10 +163,11 @@ def send_email(to_email, subject, html_content, text_content=None):
         
     try:
         conn.send_message(msg)
-        conn.quit()
         return True
     except Exception as e:
-        logger.error(f"Failed to send email: {str(e)}")
+        logger.error("Failed to send email: %s", e)
+        # The connection may be in a bad state; reconnect on the next send
+        email_config.discard_connection(conn)
         return False
 
 def send_welcome_email(to_email, username):
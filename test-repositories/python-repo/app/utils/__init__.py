@@ -4,4 +4,5 @@ Utils package for utility functions.
 This package contains:
 - validators: Input validation functions
 - helpers: Helper functions used across the app
+- json_provider: orjson-backed JSON provider for responses
 """ 
\ No newline at end of file
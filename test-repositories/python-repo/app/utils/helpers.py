@@ -1,14 +1,123 @@
 import os
 import jwt
+import time
+import threading
+from collections import OrderedDict
 from functools import wraps
+from types import MappingProxyType
 from flask import request, jsonify, render_template
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
 from ..models.user import User
-import datetime
+from .. import db
 import logging
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# JWT signing key and algorithm, resolved once at import
+JWT_SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key').encode()
+JWT_ALGORITHM = 'HS256'
+
+# Shared encoder/decoder with the required claims bound once instead of
+# merging options on every decode
+jwt_codec = jwt.PyJWT(options={'require': ['exp', 'user_id']})
+_JWT_ALGORITHMS = (JWT_ALGORITHM,)
+
+# Email templates; missing variables raise instead of rendering blank
+email_templates = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'emails')),
+    autoescape=select_autoescape(['html']),
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=-1
+)
+
+# Every template compiled once at import, keyed by file name
+EMAIL_TEMPLATES = MappingProxyType({
+    name: email_templates.get_template(name) for name in email_templates.list_templates()
+})
+
+class TokenCache:
+    """
+    LRU cache of JWTs whose signature has already been verified
+    
+    Entries expire with the token's own exp claim, and never live longer than
+    max_age, so an expired token still has to go through jwt.decode and fail.
+    """
+    def __init__(self, max_size=10000, max_age=3600):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, token):
+        """
+        Get the user ID for a previously verified token
+        
+        Args:
+            token (str): Raw JWT
+            
+        Returns:
+            int: User ID, or None if the token isn't cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+                
+            user_id, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+                
+            self._entries.move_to_end(token)
+            return user_id
+            
+    def put(self, token, user_id, exp):
+        """
+        Remember a token that passed verification
+        
+        Args:
+            token (str): Raw JWT
+            user_id (int): User ID from the token payload
+            exp (int): Token expiry as a POSIX timestamp
+        """
+        expires_at = min(exp, time.time() + self.max_age)
+        with self._lock:
+            self._entries[token] = (user_id, expires_at)
+            self._entries.move_to_end(token)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+token_cache = TokenCache()
+
+def decode_token(token):
+    """
+    Verify a JWT and return the user ID it was issued for
+    
+    Tokens verified earlier are answered from token_cache without checking the
+    signature again; only tokens that pass verification are ever cached.
+    
+    Args:
+        token (str): Raw JWT
+        
+    Returns:
+        int: User ID from the token payload
+        
+    Raises:
+        jwt.InvalidTokenError: If the token is malformed, forged, expired or
+            missing its exp or user_id claim
+    """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+        
+    # PyJWT rejects tokens past their required exp claim itself
+    data = jwt_codec.decode(token, JWT_SECRET_KEY, algorithms=_JWT_ALGORITHMS)
+    
+    token_cache.put(token, data['user_id'], data['exp'])
+    return data['user_id']
+
 def token_required(f):
     """
     Decorator to require JWT token for route
@@ -27,32 +136,24 @@ def token_required(f):
         token = None
         
         # Check if token is in headers
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+        auth_header = request.headers.get('Authorization')
+        if auth_header and auth_header.startswith('Bearer '):
+            token = auth_header[len('Bearer '):]
         
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
             
         try:
             # Decode token
-            data = jwt.decode(
-                token, 
-                os.environ.get('SECRET_KEY', 'dev_key'), 
-                algorithms=['HS256']
-            )
-            current_user = User.query.get(data['user_id'])
+            user_id = decode_token(token)
+        except jwt.InvalidTokenError as e:
+            logger.error("Token validation error: %s", e)
+            return jsonify({'error': 'Token is invalid'}), 401
             
-            if not current_user:
-                raise Exception("User not found")
-                
-            # Check if token is expired
-            if 'exp' in data and datetime.datetime.utcnow() > datetime.datetime.fromtimestamp(data['exp']):
-                raise Exception("Token has expired")
-                
-        except Exception as e:
-            logger.error(f"Token validation error: {str(e)}")
+        # Checks the session's identity map before issuing a SELECT
+        current_user = db.session.get(User, user_id)
+        if not current_user:
+            logger.error("Token validation error: User not found")
             return jsonify({'error': 'Token is invalid'}), 401
             
         # Pass the current user to the route
@@ -94,57 +195,73 @@ def format_email_template(template_name, template_data):
     Returns:
         str: Formatted template content
     """
-    try:
-        # In a real app, use render_template from Flask to load from templates directory
-        # Here we'll simulate it with a simple string template
-        
-        templates = {
-            'welcome.html': """
-                <h1>Welcome to Our Flask App, {username}!</h1>
-                <p>Thank you for joining our community. We're excited to have you on board.</p>
-                <p>You can <a href="{login_url}">login here</a> to get started.</p>
-                <p>If you have any questions, please contact <a href="mailto:{support_email}">{support_email}</a>.</p>
-            """,
-            'welcome.txt': """
-                Welcome to Our Flask App, {username}!
-                
-                Thank you for joining our community. We're excited to have you on board.
-                
-                You can login here: {login_url}
-                
-                If you have any questions, please contact {support_email}.
-            """,
-            'password_reset.html': """
-                <h1>Password Reset Request</h1>
-                <p>We received a request to reset your password. Click the link below to reset it:</p>
-                <p><a href="{reset_url}">Reset Password</a></p>
-                <p>This link will expire in {expires_in}.</p>
-                <p>If you didn't request this, please ignore this email or contact <a href="mailto:{support_email}">{support_email}</a>.</p>
-            """,
-            'password_reset.txt': """
-                Password Reset Request
-                
-                We received a request to reset your password. Copy and paste the link below to reset it:
-                
-                {reset_url}
-                
-                This link will expire in {expires_in}.
-                
-                If you didn't request this, please ignore this email or contact {support_email}.
-            """
-        }
+    template = EMAIL_TEMPLATES.get(template_name)
+    if template is None:
+        logger.error("Template %s not found", template_name)
+        return f"Template {template_name} not found"
         
-        if template_name not in templates:
-            logger.error(f"Template {template_name} not found")
-            return f"Template {template_name} not found"
-            
-        # Format the template with the provided data
-        return templates[template_name].format(**template_data)
+    try:
+        return template.render(template_data)
         
     except Exception as e:
-        logger.error(f"Error formatting email template: {str(e)}")
+        logger.error("Error formatting email template: %s", e)
         return "Error formatting email template"
 
+class PageView:
+    """
+    One page of query results
+    
+    has_next, has_prev, next_num and prev_num are derived from page and pages
+    here rather than read off the Pagination object.
+    """
+    __slots__ = ('items', 'page', 'per_page', 'total', 'pages')
+    
+    def __init__(self, items, page, per_page, total, pages):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = pages
+        
+    @property
+    def has_next(self):
+        """bool: True if there is a page after this one"""
+        return self.page < self.pages
+        
+    @property
+    def has_prev(self):
+        """bool: True if there is a page before this one"""
+        return self.page > 1
+        
+    @property
+    def next_num(self):
+        """int: Number of the next page, or None on the last page"""
+        return self.page + 1 if self.has_next else None
+        
+    @property
+    def prev_num(self):
+        """int: Number of the previous page, or None on the first page"""
+        return self.page - 1 if self.has_prev else None
+        
+    def asdict(self):
+        """
+        Build the full pagination dict, e.g. for a JSON response
+        
+        Returns:
+            dict: items, page info and next/previous page numbers
+        """
+        return {
+            'items': self.items,
+            'page': self.page,
+            'per_page': self.per_page,
+            'total': self.total,
+            'pages': self.pages,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev,
+            'next_num': self.next_num,
+            'prev_num': self.prev_num
+        }
+
 def paginate(query, page, per_page, error_out=True):
     """
     Helper function to paginate query results
@@ -156,18 +273,8 @@ def paginate(query, page, per_page, error_out=True):
         error_out (bool): Whether to raise 404 if page is out of range
         
     Returns:
-        dict: Pagination object with items, page info, etc.
+        PageView: The page's items and page info; call asdict() for a dict
     """
     pagination = query.paginate(page=page, per_page=per_page, error_out=error_out)
     
-    return {
-        'items': pagination.items,
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'has_next': pagination.has_next,
-        'has_prev': pagination.has_prev,
-        'next_num': pagination.next_num,
-        'prev_num': pagination.prev_num
-    } 
\ No newline at end of file
+    return PageView(pagination.items, pagination.page, pagination.per_page, pagination.total, pagination.pages) 
\ No newline at end of file
@@ -0,0 +1,85 @@
+import decimal
+import orjson
+from datetime import date
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+# Datetimes are passed through to _default so responses keep Flask's
+# HTTP date format; str keys are not required, matching the stdlib encoder
+_DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+def _default(obj):
+    """
+    Convert the types orjson doesn't handle the way Flask's default provider does
+    
+    Args:
+        obj: Object orjson could not serialize
+        
+    Returns:
+        str: Serializable representation of the object
+    """
+    if isinstance(obj, date):
+        return http_date(obj)
+        
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+        
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+        
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson
+    
+    Installed with app.json = OrjsonProvider(app), after which jsonify and
+    request.get_json go through orjson. Unlike Flask's default provider, keys
+    aren't sorted, non-ASCII text is sent as UTF-8 rather than \\u escapes,
+    and integers wider than 64 bits are parsed as floats and can't be
+    serialized at all.
+    """
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize data as a JSON string
+        
+        Args:
+            obj: Data to serialize
+            
+        Returns:
+            str: JSON document
+        """
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode()
+        
+    def loads(self, s, **kwargs):
+        """
+        Deserialize data from a JSON string or bytes
+        
+        Args:
+            s (str | bytes): JSON document
+            
+        Returns:
+            Deserialized data
+        """
+        return orjson.loads(s)
+        
+    def response(self, *args, **kwargs):
+        """
+        Serialize the arguments as JSON and return them as a response
+        
+        Returns:
+            Response: Response with the application/json mimetype
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        
+        # Indent in debug mode, as Flask's default provider does
+        option = _DUMPS_OPTIONS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+            
+        # Hand orjson's bytes straight to the response instead of via str
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option),
+            mimetype='application/json'
+        )
@@ -3,6 +3,18 @@ import string
 from functools import wraps
 from flask import request, jsonify
 
+# Compiled once at import; \A and \Z anchor to the whole string, so unlike $
+# a trailing newline doesn't match
+_EMAIL_RE = re.compile(r'\A[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+_USERNAME_RE = re.compile(r'\A[a-zA-Z][a-zA-Z0-9_-]{2,19}\Z')
+
+# At least 8 characters including a punctuation character; the digit check
+# stays on str.isdigit(), which accepts more than \d (e.g. superscripts)
+_PASSWORD_RE = re.compile(
+    r'\A(?=.*[' + re.escape(string.punctuation) + r']).{8,}\Z',
+    re.DOTALL
+)
+
 def validate_email(email):
     """
     Validate email format
@@ -13,8 +25,7 @@ def validate_email(email):
     Returns:
         bool: True if email is valid, False otherwise
     """
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 def validate_password(password):
     """
@@ -31,17 +42,7 @@ def validate_password(password):
     Returns:
         bool: True if password is valid, False otherwise
     """
-    if len(password) < 8:
-        return False
-        
-    if not any(c.isdigit() for c in password):
-        return False
-        
-    special_chars = set(string.punctuation)
-    if not any(c in special_chars for c in password):
-        return False
-        
-    return True
+    return _PASSWORD_RE.match(password) is not None and any(c.isdigit() for c in password)
 
 def validate_username(username):
     """
@@ -58,8 +59,7 @@ def validate_username(username):
     Returns:
         bool: True if username is valid, False otherwise
     """
-    username_pattern = r'^[a-zA-Z][a-zA-Z0-9_-]{2,19}$'
-    return bool(re.match(username_pattern, username))
+    return _USERNAME_RE.match(username) is not None
 
 def validate_post_content(content):
     """
@@ -87,6 +87,8 @@ def validate_request_json(*required_fields):
     Returns:
         function: Decorated function
     """
+    required = frozenset(required_fields)
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -95,9 +97,10 @@ def validate_request_json(*required_fields):
                 
             data = request.get_json()
             
-            # Check if all required fields are present
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
+            # Check if all required fields are present; the list of missing
+            # ones is only built when something is actually missing
+            if not required.issubset(data):
+                missing_fields = [field for field in required_fields if field not in data]
                 return jsonify({
                     'error': f"Missing required fields: {', '.join(missing_fields)}"
                 }), 400
@@ -1,4 +1,5 @@
 import os
+from types import MappingProxyType
 
 class Config:
     """
@@ -8,21 +9,31 @@ class Config:
         SECRET_KEY (str): Secret key for the app
         SQLALCHEMY_DATABASE_URI (str): SQLite database URI
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Disable modification tracking
+        SQLALCHEMY_ENGINE_OPTIONS (dict): Connection pool settings passed to create_engine
     """
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///instance/site.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Check connections on checkout and recycle them before the server drops them
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': 1800
+    }
+    
     # Email configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.example.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
-    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() == 'true'
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').strip().lower() in ('true', '1', 'yes')
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME', '')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD', '')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@example.com')
     
     # Pagination
     POSTS_PER_PAGE = 10
+    
+    # Requests running more queries than this are logged in debug and testing
+    QUERY_COUNT_THRESHOLD = 15
 
 
 class DevelopmentConfig(Config):
@@ -67,16 +78,23 @@ class ProductionConfig(Config):
     DEBUG = False
     
     # Production-specific settings
-    SQLALCHEMY_POOL_SIZE = 10
-    SQLALCHEMY_POOL_RECYCLE = 280
+    # Size the pool so that workers * (pool_size + max_overflow) stays below the
+    # database's max_connections; LIFO reuse lets idle connections time out
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_use_lifo': True
+    }
     
     # Security settings
     PREFERRED_URL_SCHEME = 'https'
 
 
-config = {
+# Read-only so the registry can't be changed at runtime
+config = MappingProxyType({
     'development': DevelopmentConfig,
     'testing': TestingConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
-} 
\ No newline at end of file
+}) 
\ No newline at end of file